@@ -19,11 +19,119 @@ helper = CanvasHelper("your_username")
 subjects = helper.subjects
 ```
 """
+import re
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util import Retry
 from urllib.parse import quote
 from bs4 import BeautifulSoup
 from .sjtu_login import login
 
+MAX_WORKERS = 8
+
+_VIDEO_API = "https://v.sjtu.edu.cn/jy-application-canvas-sjtu"
+_LTI_TOOL_URL = "https://oc.sjtu.edu.cn/courses/{}/external_tools/8329"
+_TOKEN_URL_BASE = f"{_VIDEO_API}/lti3/getAccessTokenByTokenId?"
+_VIDEO_INFO_FILES = (("playTypeHls", (None, "true")), ("isAudit", (None, "true")))
+
+_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+# Retry transient failures on the pooled connection instead of aborting the
+# whole refresh
+_RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(['GET', 'POST']),
+    respect_retry_after_header=True
+)
+
+_FORM_RE = re.compile(r'<form\b([^>]*)>(.*?)</form>', re.I | re.S)
+_INPUT_RE = re.compile(r'<input\b([^>]*)>', re.I)
+_ATTR_RE = re.compile(r'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+
+def _parse_attrs(tag: str) -> dict[str, str]:
+    """Parse the quoted attributes of an HTML start tag."""
+    return {
+        m.group(1).lower(): unescape(m.group(2) if m.group(2) is not None
+                                     else m.group(3))
+        for m in _ATTR_RE.finditer(tag)
+    }
+
+def _parse_form(html: str) -> tuple[dict[str, str], list[dict[str, str]]]:
+    """
+    Parse the first form of an auto-submitting redirect page.
+
+    The redirect pages only contain a single flat form, so a regex is enough
+    and much cheaper than building a parse tree. BeautifulSoup is used as a
+    fallback if the page does not look as expected.
+
+    Parameters
+    ----------
+    html : str
+        The HTML page containing the form.
+
+    Returns
+    -------
+    attrs : dict
+        The attributes of the `<form>` tag.
+    inputs : list of dict
+        The attributes of each `<input>` tag in the form.
+    """
+    match = _FORM_RE.search(html)
+    if match:
+        attrs = _parse_attrs(match.group(1))
+        inputs = [_parse_attrs(tag) for tag in _INPUT_RE.findall(match.group(2))]
+        if 'action' in attrs and all(
+            'name' in tag and 'value' in tag for tag in inputs
+        ):
+            return attrs, inputs
+
+    form = BeautifulSoup(html, 'html.parser').find('form')
+    return form.attrs, [input_tag.attrs for input_tag in form.find_all('input')]
+
+
+class PoolAdapter(HTTPAdapter):
+    """
+    `HTTPAdapter` whose connections keep idle sockets alive with TCP
+    keep-alive, so pooled connections to the same hosts stay usable.
+    """
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', _SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+def mount_pool_adapter(session: requests.Session) -> requests.Session:
+    """
+    Mount a keep-alive connection pool large enough for the concurrent
+    requests to Canvas and v.sjtu.edu.cn.
+
+    Parameters
+    ----------
+    session : requests.Session
+        The session to mount the adapter on.
+
+    Returns
+    -------
+    requests.Session
+        The same session, for chaining.
+    """
+    adapter = PoolAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=_RETRY
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
 class CanvasHelper:
     """
     Helper for logging into Canvas(oc.sjtu.edu.cn) and getting the access tokens
@@ -41,7 +149,7 @@ class CanvasHelper:
     """
     def __init__(self, **kwargs):
         client = "https://oc.sjtu.edu.cn/login/openid_connect"
-        self.session = login(client, **kwargs)
+        self.session = mount_pool_adapter(login(client, **kwargs))
         self.refresh(True)
 
     @property
@@ -67,7 +175,7 @@ class CanvasHelper:
         res.raise_for_status()
 
         subjects = list()
-        for subject in res.json():
+        for subject in orjson.loads(res.content):
             subjects.append({
                 "id": subject['id'], 
                 "name": subject['name'],
@@ -75,10 +183,23 @@ class CanvasHelper:
             })
         return subjects
 
+    def _fork_session(self) -> requests.Session:
+        """
+        Create a session with a copy of the cookies of `self.session`, sharing
+        its mounted adapters (and thus its connection pools).
+        """
+        session = requests.Session()
+        session.headers.update(self.session.headers)
+        session.cookies = self.session.cookies.copy()
+        for prefix, adapter in self.session.adapters.items():
+            session.mount(prefix, adapter)
+        return session
+
     def _redirect_request(self, 
                       method: str, 
                       url: str, 
-                      data: dict = None) -> tuple[str, dict]:
+                      data: dict = None,
+                      session: requests.Session = None) -> tuple[str, dict]:
         """
         Make a request and parse the redirect form.
 
@@ -90,6 +211,8 @@ class CanvasHelper:
             The URL to send the request to.
         data : dict, optional
             The data to send in the request (for POST requests).
+        session : requests.Session, optional
+            The session to send the request with. Default is `self.session`.
 
         Returns
         -------
@@ -98,20 +221,22 @@ class CanvasHelper:
         payload : dict
             The form data to send in the redirect request.
         """
-        res = self.session.request(method, url, data=data)
+        if session is None:
+            session = self.session
+        res = session.request(method, url, data=data)
         res.raise_for_status()
 
-        soup = BeautifulSoup(res.text, 'html.parser')
-        form = soup.find('form')
-        if form['id'] == "login_form":
+        form, inputs = _parse_form(res.text)
+        if form.get('id') == "login_form":
                 raise RuntimeError("Login required.")
 
         target_url = form['action']
-        inputs = form.find_all('input')
         payload = {input_tag['name']: input_tag['value'] for input_tag in inputs}
         return target_url, payload
 
-    def get_access_token(self, subject_id: int) -> tuple[str, str]:
+    def get_access_token(self,
+                         subject_id: int,
+                         session: requests.Session = None) -> tuple[str, str]:
         """
         Get the access token for a subject with the given ID.
         Simulate the process of clicking "Classroom Video New" button to
@@ -126,6 +251,9 @@ class CanvasHelper:
         ----------
         subject_id : int
             The ID of the subject to get the access token for.
+        session : requests.Session, optional
+            The session to run the redirect chain on. Default is
+            `self.session`.
 
         Returns
         -------
@@ -134,24 +262,28 @@ class CanvasHelper:
         canvas_subject_id : str
             The Canvas subject ID.
         """
+        if session is None:
+            session = self.session
+
         # First redirect: to LTI tool
-        url = f"https://oc.sjtu.edu.cn/courses/{subject_id}/external_tools/8329"
-        url, payload = self._redirect_request('GET', url)  
+        url = _LTI_TOOL_URL.format(subject_id)
+        url, payload = self._redirect_request('GET', url, session=session)
 
         # Second redirect: login to v.sjtu.edu.cn
-        url, payload = self._redirect_request('POST', url, data=payload)
+        url, payload = self._redirect_request(
+            'POST', url, data=payload, session=session
+        )
 
         # Third redirect to get token ID
-        res = self.session.post(url, data=payload, allow_redirects=False)
+        res = session.post(url, data=payload, allow_redirects=False)
         res.raise_for_status()
         url = res.headers.get('Location')
         query = url.split('?')[1]
 
-        url = "https://v.sjtu.edu.cn/jy-application-canvas-sjtu/lti3/getAccessTokenByTokenId"
-        url += "?" + query
-        res = self.session.get(url)
+        url = _TOKEN_URL_BASE + query
+        res = session.get(url)
         res.raise_for_status()
-        res = res.json()
+        res = orjson.loads(res.content)
         assert int(res['code']) == 0, res.get('message', 'Unknown error')
 
         data = res['data']
@@ -159,17 +291,40 @@ class CanvasHelper:
         canvas_subject_id = data['params']['courId']
         return access_token, canvas_subject_id
 
-    def refresh(self, update_subjects: bool = False):
-        """Refresh the access tokens for all subjects."""
+    def refresh(self,
+                update_subjects: bool = False,
+                max_workers: int = MAX_WORKERS):
+        """
+        Refresh the access tokens for all subjects.
+
+        Parameters
+        ----------
+        update_subjects : bool, optional
+            Whether to reload the subject list before refreshing the tokens.
+            Default is False.
+        max_workers : int, optional
+            The maximum number of redirect chains in flight at the same time.
+            Default is `MAX_WORKERS`.
+        """
         if not hasattr(self, '_subjects') or update_subjects:
             self._subjects = self.get_subject_list()
 
-        # TODO: Parallel requests may speed up this process
-        for subject in self._subjects:
-            subject_id = subject['id']
-            access_token, canvas_subject_id = self.get_access_token(subject_id)
-            subject['access_token'] = access_token
-            subject['canvas_subject_id'] = canvas_subject_id
+        # Each token fetch is a chain of blocking redirects, so fetch the
+        # subjects concurrently. Every chain runs on its own session so that
+        # the LTI state and v.sjtu.edu.cn cookies set mid-chain are not
+        # overwritten by another chain in flight.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda subject: self.get_access_token(
+                    subject['id'], self._fork_session()
+                ),
+                self._subjects
+            )
+            for subject, (access_token, canvas_subject_id) in zip(
+                self._subjects, results
+            ):
+                subject['access_token'] = access_token
+                subject['canvas_subject_id'] = canvas_subject_id
 
 
 class CourseHelper:
@@ -185,12 +340,22 @@ class CourseHelper:
         The access token for the subject.
     canvas_subject_id : str
         The Canvas subject ID.
+    session : requests.Session, optional
+        The session to send requests with. Pass the session of a
+        `CanvasHelper` to share its connection pool. If not specified, a new
+        pooled session is created.
     """
     def __init__(self,
                  access_token: str,
-                 canvas_subject_id: str):
+                 canvas_subject_id: str,
+                 session: requests.Session = None):
         self._token = access_token
         self._id = canvas_subject_id
+        self._headers = {'token': access_token}
+        self._course_info_payload = {"canvasCourseId": quote(canvas_subject_id)}
+        if session is None:
+            session = mount_pool_adapter(requests.Session())
+        self.session = session
     
     @property
     def courses(self) -> list[dict]:
@@ -199,7 +364,8 @@ class CourseHelper:
         return self._courses
 
     @staticmethod
-    def from_dict(data: dict) -> 'CourseHelper':
+    def from_dict(data: dict,
+                  session: requests.Session = None) -> 'CourseHelper':
         """
         Load data from a local dictionary.
 
@@ -208,10 +374,13 @@ class CourseHelper:
         data : dict
             A dictionary containing the access token, canvas subject ID,
             and courses information.
+        session : requests.Session, optional
+            The session to send requests with.
         """
         helper = CourseHelper(
             access_token=data.get('access_token', ''),
-            canvas_subject_id=data.get('canvas_subject_id', '')
+            canvas_subject_id=data.get('canvas_subject_id', ''),
+            session=session
         )
         helper._courses = data.get('courses', [])
         return helper
@@ -219,9 +388,7 @@ class CourseHelper:
     def refresh(self):
         """Refresh all the courses information and download video URLs."""
         self._courses = self.get_course_info()
-        for course in self._courses:
-            download_urls = self.get_video_url(course['video_id'])
-            course['download_urls'] = download_urls
+        self._fetch_video_urls(self._courses)
 
     def update(self):
         """Only update the courses information without downloading video URLs."""
@@ -231,23 +398,37 @@ class CourseHelper:
 
         updated = self.get_course_info()
         current = {c['id']: c for c in self._courses}
+        pending = list()
         for course in updated:
             cid = course['id']
             if cid in current and current[cid].get('download_urls', None):
                 continue
-            download_urls = self.get_video_url(course['video_id'])
-            course['download_urls'] = download_urls 
+            pending.append(course)
             current[cid] = course
+        self._fetch_video_urls(pending)
         self._courses = list(current.values())
 
+    def _fetch_video_urls(self, courses: list[dict]):
+        """
+        Fetch the download URLs for the given courses concurrently. Courses
+        sharing the same video are only fetched once.
+        """
+        video_ids = list(dict.fromkeys(c['video_id'] for c in courses))
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = executor.map(self.get_video_url, video_ids)
+            urls = dict(zip(video_ids, results))
+        for course in courses:
+            course['download_urls'] = dict(urls[course['video_id']])
+
     ## --------------------- Course Information Methods --------------------- ##
     def get_course_info(self) -> list[dict]:
         """Get the courses information for the subject."""
-        url = "https://v.sjtu.edu.cn/jy-application-canvas-sjtu/directOnDemandPlay/findVodVideoList"
-        payload = {"canvasCourseId": quote(self._id)}
-        res = requests.post(url, json=payload, headers={'token': self._token})
+        url = f"{_VIDEO_API}/directOnDemandPlay/findVodVideoList"
+        res = self.session.post(url,
+                                json=self._course_info_payload,
+                                headers=self._headers)
         res.raise_for_status()
-        res = res.json()
+        res = orjson.loads(res.content)
         if int(res['code']) == -1 or not res['data']:
             return list()
 
@@ -280,16 +461,14 @@ class CourseHelper:
             0: Classroom camera recording
             1: Computer screen recording
         """
-        url = "https://v.sjtu.edu.cn/jy-application-canvas-sjtu/directOnDemandPlay/getVodVideoInfos"
-        files = {
-            "playTypeHls": (None, "true"),
-            "isAudit": (None, "true"),
-            "id": (None, video_id)
-        }
+        url = f"{_VIDEO_API}/directOnDemandPlay/getVodVideoInfos"
+        files = _VIDEO_INFO_FILES + (("id", (None, video_id)),)
 
-        res = requests.post(url, files=files, headers={'token': self._token})
+        res = self.session.post(url,
+                                files=files,
+                                headers=self._headers)
         res.raise_for_status()
-        data = res.json().get('data')
+        data = orjson.loads(res.content).get('data')
 
         videos = dict()
         for video in data.get('videoPlayResponseVoList', []):
@@ -318,16 +497,16 @@ class CourseHelper:
             - 'dt_end': End time of the transcript segment.
             - 'content': The transcript text in the specified language.
         """
-        url = "https://v.sjtu.edu.cn/jy-application-canvas-sjtu/transfer/translate/detail"
+        url = f"{_VIDEO_API}/transfer/translate/detail"
         payload = {
             'courseId': course_id,
             'platform': 1
         }
-        res = requests.post(url,
-                            json=payload,
-                            headers={'token': self._token})
+        res = self.session.post(url,
+                                json=payload,
+                                headers=self._headers)
         res.raise_for_status()
-        data = res.json().get('data')
+        data = orjson.loads(res.content).get('data')
         if not data:
             return list()
 
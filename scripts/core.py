@@ -1,7 +1,13 @@
 import os.path
+import re
 import time
-from .utils import aria2, parse_srt
-from .canvas import CanvasHelper, CourseHelper
+from concurrent.futures import ThreadPoolExecutor
+from typing import TextIO
+import requests
+from .utils import aria2, save_srt
+from .canvas import MAX_WORKERS, CanvasHelper, CourseHelper, mount_pool_adapter
+
+_EXT_RE = re.compile(r'\.([A-Za-z0-9]+)(?:\?|$)')
 
 
 class Manager:
@@ -9,9 +15,12 @@ class Manager:
         self.subjects: list[dict] = []
         self.last_update_at: float | None = None
         self._cour_helpers: dict[int, CourseHelper] = {}
+        self._session: requests.Session | None = None
+        self._subjects_indexed: dict[int, tuple[str, dict]] | None = None
 
         if len(kwargs) > 0:
             self._subj_helper = CanvasHelper(**kwargs)
+            self._session = self._subj_helper.session
             self.subjects = self._subj_helper.subjects
             self.refresh()
 
@@ -31,17 +40,18 @@ class Manager:
         Manager
             An instance of Manager populated with data from the JSON file.
         """
-        import json
+        import orjson
 
         with open(filepath, 'r') as f:
-            data = json.load(f)
+            data = orjson.loads(f.read())
 
         mgr = Manager()
         mgr.subjects = data.get('subjects', [])
         mgr.last_update_at = data.get('last_update_at', None)
+        mgr._session = mount_pool_adapter(requests.Session())
         mgr._cour_helpers = {
             subj['id']: CourseHelper(
-                subj['access_token'], subj['canvas_subject_id']
+                subj['access_token'], subj['canvas_subject_id'], mgr._session
             ) for subj in mgr.subjects
         }
         return mgr
@@ -50,71 +60,89 @@ class Manager:
         """Refresh all the courses information for all subjects."""
         for subj in self.subjects:
             helper = CourseHelper(
-                subj['access_token'], subj['canvas_subject_id']
+                subj['access_token'], subj['canvas_subject_id'], self._session
             )
             self._cour_helpers[subj['id']] = helper
 
             helper.update()
             subj['courses'] = helper.courses
             subj['total'] = len(helper.courses)
+        self._subjects_indexed = None
         self.last_update_at = time.time()
 
     def download(self, 
                courses: dict[int, list], 
                dirpath: os.PathLike, 
                with_screen_record: bool = False):
-        subjects = {subj['id']: subj.copy() for subj in self.subjects}
-        for subj in subjects.values():
-            subj['courses'] = {c['id']: c for c in subj['courses']}
-
+        subjects = self._indexed_subjects()
         os.makedirs(dirpath, exist_ok=True)
-        download_txt = self._generate_aria2_txt(
-            courses, subjects, with_screen_record
-        )
         with open(os.path.join(dirpath, 'download.txt'), 'w') as f:
-            f.write(download_txt)
+            self._generate_aria2_txt(courses, subjects, f, with_screen_record)
 
+        pending = list()
         for subj_id, course_ids in courses.items():
-            subj = subjects.get(subj_id)
+            subj_name, subj_courses = subjects.get(subj_id)
             helper = self._cour_helpers.get(subj_id)
-            os.makedirs(os.path.join(dirpath, subj['name']), exist_ok=True)
+            os.makedirs(os.path.join(dirpath, subj_name), exist_ok=True)
 
             for cid in course_ids:
-                course = subj['courses'].get(cid)
-                transcripts = helper.get_transcripts(cid)
-                srt_content = parse_srt(transcripts)
-                with open(
-                    os.path.join(
-                        dirpath, subj['name'], f"{course['name']}_0.srt"
-                    ), 'w', encoding='utf-8'
-                ) as f:
-                    f.write(srt_content)
-
-        aria2(dirpath)
+                course = subj_courses.get(cid)
+                srt_path = os.path.join(
+                    dirpath, subj_name, f"{course['name']}_0.srt"
+                )
+                pending.append((helper, cid, srt_path))
+
+        # Start downloading the videos while the transcripts are fetched
+        process = aria2(dirpath, wait=False)
+
+        def save_transcripts(item: tuple[CourseHelper, int, str]):
+            helper, cid, srt_path = item
+            save_srt(helper.get_transcripts(cid), srt_path)
+
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                # Consume the results so that worker errors are raised here
+                list(executor.map(save_transcripts, pending))
+            process.wait()
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+
+    def _indexed_subjects(self) -> dict[int, tuple[str, dict[int, dict]]]:
+        """
+        Index the subjects and their courses by ID, as `(name, courses)`
+        tuples. The index is cached until the next `refresh`.
+        """
+        if self._subjects_indexed is None:
+            self._subjects_indexed = {
+                subj['id']: (
+                    subj['name'], {c['id']: c for c in subj['courses']}
+                ) for subj in self.subjects
+            }
+        return self._subjects_indexed
 
     def _generate_aria2_txt(self, 
                             course_ids: dict[int, list], 
-                            subjects: dict[int, dict],
-                            with_screen_record: bool = False) -> str:
+                            subjects: dict[int, tuple[str, dict[int, dict]]],
+                            f: TextIO,
+                            with_screen_record: bool = False):
         """
-        Generate aria2 download.txt content for the specified courses.
+        Write aria2 download.txt entries for the specified courses to `f`.
         """
-        download_queue = []
         for subj_id, course_id_list in course_ids.items():
-            subj = subjects.get(subj_id)
-            subj_name = subj.get('name')
+            subj_name, subj_courses = subjects.get(subj_id)
             for course_id in course_id_list:
-                course = subj['courses'].get(course_id)
+                course = subj_courses.get(course_id)
                 course_name = course.get('name')
                 for k, v in course.get('download_urls', {}).items():
                     if (not with_screen_record) and int(k) == 1:
                         continue
 
-                    exf = v.split('?')[0].split('.')[-1]
+                    match = _EXT_RE.search(v)
+                    if match:
+                        exf = match.group(1)
+                    else:
+                        exf = v.split('?')[0].split('.')[-1]
                     output_path = f"{subj_name}/{course_name}_{k}.{exf}"
-                    download_queue.append((v, output_path))
-
-        download_queue = [
-            f"{url}\n  out={path}\n" for url, path in download_queue
-        ]
-        return '\n'.join(download_queue)
+                    f.write(f"{v}\n  out={output_path}\n\n")
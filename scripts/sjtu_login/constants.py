@@ -2,4 +2,5 @@ HEADERS = {
     "Accept-Language": "zh-CN",
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.3 Safari/605.1.15"
 }
-MAX_ATTEMPTS = 5
\ No newline at end of file
+MAX_ATTEMPTS = 5
+TIMEOUT = (5, 10)  # (connect, read) in seconds
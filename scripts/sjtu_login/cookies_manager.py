@@ -2,6 +2,9 @@ import os.path
 from http.cookiejar import LWPCookieJar, LoadError
 from requests.cookies import RequestsCookieJar
 
+# Parsed cookie files, keyed by path: (mtime, cookies)
+_COOKIE_CACHE: dict[str, tuple[float, dict[str, str]]] = {}
+
 def load_cookies(cookie_path: os.PathLike) -> dict[str, str] | None:
     """
     Load JAAuthCookie from local cookie file.
@@ -17,13 +20,20 @@ def load_cookies(cookie_path: os.PathLike) -> dict[str, str] | None:
         A dictionary containing the JAAuthCookie if found, otherwise None.
     """
     if cookie_path and os.path.exists(cookie_path):
-        jar = LWPCookieJar(cookie_path)
-        try:
-            jar.load(ignore_discard=True)
-        except LoadError:
-            return
-        cookies = {cookie.name: cookie.value for cookie in jar}
-        
+        key = os.fspath(cookie_path)
+        mtime = os.path.getmtime(cookie_path)
+        cached = _COOKIE_CACHE.get(key)
+        if cached and cached[0] == mtime:
+            cookies = cached[1]
+        else:
+            jar = LWPCookieJar(cookie_path)
+            try:
+                jar.load(ignore_discard=True)
+            except LoadError:
+                return
+            cookies = {cookie.name: cookie.value for cookie in jar}
+            _COOKIE_CACHE[key] = (mtime, cookies)
+
         if cookies.get('JAAuthCookie', None):
             return {'JAAuthCookie': cookies.get('JAAuthCookie')}
 
@@ -46,4 +56,5 @@ def save_cookies(cookies: RequestsCookieJar, cookie_path: os.PathLike) -> None:
             jar.set_cookie(cookie)
             break
     jar.save(ignore_discard=True, ignore_expires=True)
+    _COOKIE_CACHE.pop(os.fspath(cookie_path), None)
     print(f"Cookies saved to {cookie_path}")
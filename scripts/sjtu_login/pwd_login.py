@@ -1,12 +1,41 @@
 import getpass
 import time
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 import requests
+from requests.adapters import HTTPAdapter
 from requests.cookies import RequestsCookieJar
+from urllib3.util import Retry
 import numpy as np
 from PIL import Image
 
-from .constants import HEADERS
+from .constants import HEADERS, TIMEOUT
+
+# Keeps the connection to jaccount.sjtu.edu.cn alive across captcha retries
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        connect=3,
+        read=2,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        # Connect errors are retried for any method, but never resend the
+        # login POST once it may have reached the server
+        allowed_methods=frozenset(['GET'])
+    )
+)
+
+def new_session() -> requests.Session:
+    """
+    Create a session for a single password login, pooled through the shared
+    keep-alive adapter. The cookies never outlive the login.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount('https://', _ADAPTER)
+    return session
 
 ## -------------------------------- Captcha -------------------------------- ##
 def remove_padding(data: np.ndarray) -> np.ndarray:
@@ -16,26 +45,56 @@ def remove_padding(data: np.ndarray) -> np.ndarray:
     Parameters
     ----------
     data : np.ndarray
-        A 2D binary numpy array where 1 represents white pixels and 0 represents
-        black pixels.
+        A 2D binary numpy array where 1 (or True) represents white pixels and
+        0 (or False) represents black pixels.
 
     Returns
     -------
     np.ndarray
         The input array with padding removed.
     """
-    row_cond = ~np.all(data == 1, axis=1)
-    row_idx = np.where(row_cond)[0]
-    if len(row_idx) > 0:
-        data = data[row_idx[0]: row_idx[-1]+1, :]
+    row_cond = data.sum(axis=1) != data.shape[1]
+    if row_cond.any():
+        first = row_cond.argmax()
+        last = len(row_cond) - row_cond[::-1].argmax()
+        data = data[first:last, :]
 
-    col_cond = ~np.all(data == 1, axis=0)
-    col_idx = np.where(col_cond)[0]
-    if len(col_idx) > 0:
-        data = data[:, col_idx[0]: col_idx[-1]+1]
+    col_cond = data.sum(axis=0) != data.shape[0]
+    if col_cond.any():
+        first = col_cond.argmax()
+        last = len(col_cond) - col_cond[::-1].argmax()
+        data = data[:, first:last]
 
     return data
 
+def render_captcha(image: Image) -> str:
+    """
+    Render the captcha image as ASCII characters.
+
+    Parameters
+    ----------
+    image : PIL.Image
+        The captcha image to be rendered.
+
+    Returns
+    -------
+    str
+        The rendered captcha, one line per pixel row.
+    """
+    if image.mode != "L":
+        image = image.convert("L")
+    data = np.asarray(image, dtype=np.uint8)
+    # Otsu's threshold, computed from the 256-bin histogram
+    hist = np.bincount(data.ravel(), minlength=256).astype(np.float64)
+    prob = hist / hist.sum()
+    omega = np.cumsum(prob)
+    mu = np.cumsum(prob * np.arange(256))
+    sigma_b2 = (mu[-1] * omega - mu) ** 2 / (omega * (1 - omega) + 1e-12)
+    data = data > int(np.argmax(sigma_b2))
+    data = remove_padding(data)
+    chars = np.where(data, ord(" "), ord("#")).astype(np.uint8)
+    return "\n".join(row.tobytes().decode("ascii") for row in chars)
+
 def print_captcha_in_console(image: Image) -> None:
     """
     Print the captcha image in the console using ASCII characters.
@@ -45,17 +104,11 @@ def print_captcha_in_console(image: Image) -> None:
     image : PIL.Image
         The captcha image to be printed.
     """
-    image = image.convert("L")
-    data = np.array(image)
-    data = (data - data.min()) / (data.max() - data.min())
-    data = (data > 0.5).astype(int)
-    data = remove_padding(data)
-    for row in data:
-        print("".join(" " if x else "#" for x in row))
+    print(render_captcha(image))
 
 
 ## --------------------------------- Login --------------------------------- ##
-def get_captcha_image(url: str, uuid: str) -> Image:
+def get_captcha_image(url: str, uuid: str, session: requests.Session) -> Image:
     """
     Get the captcha image from the server.
 
@@ -66,23 +119,34 @@ def get_captcha_image(url: str, uuid: str) -> Image:
         initial login attempt.
     uuid : str
         The UUID parameter for the captcha request.
+    session : requests.Session
+        The session of the current login.
 
     Returns
     -------
     Image
-        The captcha image as a PIL Image object.
+        The captcha image as a grayscale PIL Image object.
     """
-    res = requests.get(
+    res = session.get(
         "https://jaccount.sjtu.edu.cn/jaccount/captcha",
-        params={"uuid": uuid, "t": time.time_ns()//1000000},
-        headers={"Referer": url, **HEADERS},
+        # `t` only busts caches; the UUID already scopes it to this login
+        params={"uuid": uuid, "t": time.monotonic_ns() // 1_000_000},
+        headers={"Referer": url},
+        timeout=TIMEOUT
     )
     res.raise_for_status()
     image = Image.open(BytesIO(res.content))
-    return image
+    # Let the JPEG decoder output grayscale directly (no-op for other formats)
+    image.draft("L", image.size)
+    return image.convert("L")
+
+def fetch_rendered_captcha(url: str, uuid: str, session: requests.Session) -> str:
+    """Get the captcha image from the server and render it as ASCII."""
+    return render_captcha(get_captcha_image(url, uuid, session))
 
 def send_login_request(
-        user: str, pwd: str, captcha: str, params: dict
+        user: str, pwd: str, captcha: str, params: dict,
+        session: requests.Session
     ) -> tuple[dict, RequestsCookieJar]:
     """
     Send a login post request to the server.
@@ -97,6 +161,8 @@ def send_login_request(
         The captcha string entered by the user.
     params : dict
         Additional parameters required for the login request, including UUID.
+    session : requests.Session
+        The session of the current login.
 
     Returns
     -------
@@ -114,11 +180,11 @@ def send_login_request(
         **params
     }
 
-    res = requests.post(url, data=payload, headers=HEADERS, timeout=10)
+    res = session.post(url, data=payload, timeout=TIMEOUT)
     res.raise_for_status()
     return res.json(), res.cookies
 
-def parse_login_state(url: str, data: dict):
+def parse_login_state(url: str, data: dict, session: requests.Session):
     """
     Parse the login state from the server response.
     
@@ -129,6 +195,8 @@ def parse_login_state(url: str, data: dict):
         initial login attempt.
     data : dict
         The JSON response from the server.
+    session : requests.Session
+        The session of the current login.
 
     Returns
     -------
@@ -143,7 +211,7 @@ def parse_login_state(url: str, data: dict):
         If an unknown error occurs.
     """
     if int(data.get('errno', 1)) == 0:
-        res = requests.get(url, headers=HEADERS, timeout=10)
+        res = session.get(url, timeout=TIMEOUT)
         res.raise_for_status()
         return 0
     else:
@@ -175,25 +243,39 @@ def login_with_pwd(url: str, params: dict) -> RequestsCookieJar:
         The cookies set by the server upon successful login.
     """
     current_user = ''
-    while True:
-        user = input(f"Enter username{('(' + current_user + ')') if current_user else ''}: ")
-        if user:
-            current_user = user
-        elif current_user:
-            user = current_user
-            print(f"Using username: {user}")
+    uuid = params.get("uuid")
+    session = new_session()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        while True:
+            # Fetch the captcha while the user types the credentials. Never
+            # fetch ahead of the one being answered: the server only accepts
+            # the latest captcha issued for the UUID.
+            captcha_future = executor.submit(
+                fetch_rendered_captcha, url, uuid, session
+            )
 
-        pwd = getpass.getpass("Enter password: ")
+            user = input(f"Enter username{('(' + current_user + ')') if current_user else ''}: ")
+            if user:
+                current_user = user
+            elif current_user:
+                user = current_user
+                print(f"Using username: {user}")
 
-        while True:
-            captcha_img = get_captcha_image(url, params.get("uuid"))
-            print_captcha_in_console(captcha_img)
-            captcha = input("Enter captcha: ")
-            res, cookies = send_login_request(user, pwd, captcha, params)
-            state_code = parse_login_state(url, res)
-            if state_code == 0:
-                return cookies
-            elif state_code == 1:
-                break
-            elif state_code == 2:
-                continue
+            pwd = getpass.getpass("Enter password: ")
+
+            while True:
+                print(captcha_future.result())
+                captcha = input("Enter captcha: ")
+                res, cookies = send_login_request(
+                    user, pwd, captcha, params, session
+                )
+                state_code = parse_login_state(url, res, session)
+                if state_code == 0:
+                    return cookies
+                elif state_code == 1:
+                    break
+                elif state_code == 2:
+                    captcha_future = executor.submit(
+                        fetch_rendered_captcha, url, uuid, session
+                    )
+                    continue
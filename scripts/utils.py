@@ -1,43 +1,91 @@
 import os
 import subprocess
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterator
 
+_get_cue = itemgetter('dt_start', 'dt_end', 'content')
+_TWO_DIGITS = tuple(f"{i:02}" for i in range(100))
+_THREE_DIGITS = tuple(f"{i:03}" for i in range(1000))
+
+@lru_cache(maxsize=8192)
 def format_srt_timestamp(ms: int) -> str:
     """Convert milliseconds to SRT timestamp format (HH:MM:SS,mmm)."""
-    hours = ms // 3600000
-    ms %= 3600000
-    minutes = ms // 60000
-    ms %= 60000
-    seconds = ms // 1000
-    milliseconds = ms % 1000
-    return f"{hours:02}:{minutes:02}:{seconds:02},{milliseconds:03}"
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, milliseconds = divmod(ms, 1000)
+    hh = _TWO_DIGITS[hours] if hours < 100 else str(hours)
+    return (hh + ":" + _TWO_DIGITS[minutes] + ":" + _TWO_DIGITS[seconds]
+            + "," + _THREE_DIGITS[milliseconds])
+
+def iter_srt_cues(transcripts: list[dict]) -> Iterator[str]:
+    """Yield the SRT cues of a list of transcript dictionaries one by one."""
+    for idx, item in enumerate(transcripts, start=1):
+        dt_start, dt_end, content = _get_cue(item)
+        start_time = format_srt_timestamp(dt_start)
+        end_time = format_srt_timestamp(dt_end)
+        content = content.replace('\n', ' ').strip()
+        yield f"{idx}\n{start_time} --> {end_time}\n{content}"
 
 def parse_srt(transcripts: list[dict]) -> str:
     """Convert a list of transcript dictionaries to SRT format."""
-    srt_content = ""
-    for idx, item in enumerate(transcripts, start=1):
-        start_time = format_srt_timestamp(item['dt_start'])
-        end_time = format_srt_timestamp(item['dt_end'])
-        content = item['content'].replace('\n', ' ').strip()
-        srt_content += f"{idx}\n{start_time} --> {end_time}\n{content}\n\n"
-    return srt_content.strip()
+    return "\n\n".join(iter_srt_cues(transcripts)).strip()
 
 def save_srt(transcripts: list[dict], filepath: os.PathLike):
-    """Save transcripts to an SRT file."""
-    srt_content = parse_srt(transcripts)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(srt_content)
+    """
+    Save transcripts to an SRT file, writing cue by cue so that the whole
+    SRT content is never held in memory.
+    """
+    with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        write = f.write
+        cue = None
+        for next_cue in iter_srt_cues(transcripts):
+            if cue is not None:
+                write(cue)
+                write("\n\n")
+            cue = next_cue
+        # Match the trailing `.strip()` of `parse_srt`
+        if cue is not None:
+            write(cue.rstrip())
 
-def aria2(dir_path: os.PathLike):
-    """Use aria2 to download files listed in download.txt within `dir_path`."""
+def aria2(dir_path: os.PathLike,
+          wait: bool = True,
+          file_allocation: str | None = None) -> subprocess.Popen:
+    """
+    Use aria2 to download files listed in download.txt within `dir_path`.
+    If `wait` is False, return the running aria2 process without waiting for
+    the downloads to finish. `file_allocation` is passed to aria2's
+    `--file-allocation` (e.g. "falloc" on ext4/xfs); aria2's default is kept
+    if not specified.
+    """
     command = [
         'aria2c',
+        '-j', '16',
         '-x', '16',
         '-s', '16',
         '-k', '1M',
         '--auto-file-renaming=false',
         '--allow-overwrite=false',
         '--conditional-get=true',
+        '--async-dns=true',
+        '--disk-cache=64M',
+        '--optimize-concurrent-downloads=true',
+        '--connect-timeout=5',
+        '--timeout=30',
+        '--max-tries=3',
+        '--retry-wait=2',
         '-d', dir_path,
         '-i', f"{dir_path}/download.txt"
     ]
-    subprocess.run(command)
\ No newline at end of file
+    if file_allocation:
+        command.insert(1, f'--file-allocation={file_allocation}')
+    process = subprocess.Popen(command)
+    if wait:
+        try:
+            process.wait()
+        except BaseException:
+            # e.g. KeyboardInterrupt from a Jupyter interrupt, which only
+            # reaches the kernel and would leave aria2c running
+            process.kill()
+            raise
+    return process